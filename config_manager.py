@@ -1,37 +1,20 @@
 # config_manager.py
 # -*- coding: utf-8 -*-
+import copy
 import json
 import os
+import queue
 import threading
 from llm_adapters import create_llm_adapter
 from embedding_adapters import create_embedding_adapter
 
+try:
+    import orjson
+except ImportError:  # orjson 为可选依赖，未安装时退回标准库 json
+    orjson = None
 
-def load_config(config_file: str) -> dict:
-    """从指定的 config_file 加载配置，若不存在则创建一个默认配置文件。"""
-    
-    if not os.path.exists(config_file):
-        return create_config(config_file)
-
-    try:
-        with open(config_file, 'r', encoding='utf-8') as f:
-            config = json.load(f)
-            # 验证配置文件的完整性
-            if not isinstance(config, dict):
-                raise ValueError("配置文件格式错误")
-            return config
-    except json.JSONDecodeError as e:
-        print(f"配置文件JSON格式错误: {e}")
-        return create_config(config_file)
-    except Exception as e:
-        print(f"加载配置文件失败: {e}")
-        return {}
-
-
-# PenBo 增加了创建默认配置文件函数
-def create_config(config_file: str) -> dict:
-    """创建一个创建默认配置文件。"""
-    config = {
+# 默认配置，创建配置文件时使用
+_DEFAULT_CONFIG = {
     "last_interface_format": "Ollama",
     "last_embedding_interface_format": "Ollama",
     "llm_configs": {
@@ -101,6 +84,89 @@ def create_config(config_file: str) -> dict:
         "webdav_password": ""
     }
 }
+
+# 配置测试任务共用的线程池，避免每次点击测试按钮都新建线程
+# 工作线程为守护线程，网络请求未结束时也不会阻塞程序退出
+_TEST_MAX_WORKERS = 4
+_TEST_QUEUE: queue.Queue = queue.Queue()
+_TEST_WORKERS: list[threading.Thread] = []
+_TEST_WORKERS_LOCK = threading.Lock()
+
+
+def _test_worker():
+    """从任务队列中取出配置测试任务并执行。"""
+    while True:
+        task = _TEST_QUEUE.get()
+        try:
+            task()
+        except Exception as e:
+            print(f"配置测试任务出错: {e}")
+        finally:
+            _TEST_QUEUE.task_done()
+
+
+def _submit_test_task(task):
+    """提交配置测试任务，按需启动工作线程（最多 _TEST_MAX_WORKERS 个）。"""
+    with _TEST_WORKERS_LOCK:
+        if len(_TEST_WORKERS) < _TEST_MAX_WORKERS:
+            worker = threading.Thread(
+                target=_test_worker,
+                name=f"cfgtest_{len(_TEST_WORKERS)}",
+                daemon=True
+            )
+            worker.start()
+            _TEST_WORKERS.append(worker)
+    _TEST_QUEUE.put(task)
+
+
+def _json_loads(data: bytes):
+    """解析JSON字节串，优先使用 orjson。"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_dumps(obj) -> bytes:
+    """将对象序列化为格式化的UTF-8 JSON字节串，优先使用 orjson。"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, ensure_ascii=False, indent=4).encode('utf-8')
+
+
+def load_config(config_file: str) -> dict:
+    """从指定的 config_file 加载配置，若不存在则创建一个默认配置文件。"""
+    
+    try:
+        st = os.stat(config_file)
+    except FileNotFoundError:
+        return create_config(config_file)
+    except OSError as e:
+        print(f"加载配置文件失败: {e}")
+        return {}
+
+    # 空文件无需解析，直接重建默认配置
+    if st.st_size == 0:
+        return create_config(config_file)
+
+    try:
+        with open(config_file, 'rb', buffering=0) as f:
+            config = _json_loads(f.read())
+        # 验证配置文件的完整性
+        if not isinstance(config, dict):
+            raise ValueError("配置文件格式错误")
+        return config
+    except json.JSONDecodeError as e:
+        print(f"配置文件JSON格式错误: {e}")
+        return create_config(config_file)
+    except Exception as e:
+        print(f"加载配置文件失败: {e}")
+        return {}
+
+
+# PenBo 增加了创建默认配置文件函数
+def create_config(config_file: str) -> dict:
+    """创建一个创建默认配置文件。"""
+    config = copy.deepcopy(_DEFAULT_CONFIG)
     save_config(config, config_file)
     return config
 
@@ -108,11 +174,19 @@ def create_config(config_file: str) -> dict:
 
 def save_config(config_data: dict, config_file: str) -> bool:
     """将 config_data 保存到 config_file 中，返回 True/False 表示是否成功。"""
+    # 先写入同目录下的临时文件再替换，避免写入中途崩溃导致配置文件损坏
+    tmp_file = config_file + ".tmp"
     try:
-        with open(config_file, 'w', encoding='utf-8') as f:
-            json.dump(config_data, f, ensure_ascii=False, indent=4)
+        with open(tmp_file, 'wb') as f:
+            f.write(_json_dumps(config_data))
+        os.replace(tmp_file, config_file)
         return True
-    except:
+    except Exception:
+        # 写入或替换失败时清理残留的临时文件
+        try:
+            os.remove(tmp_file)
+        except OSError:
+            pass
         return False
 
 def test_llm_config(interface_format, api_key, base_url, model_name, temperature, max_tokens, timeout, log_func, handle_exception_func):
@@ -141,7 +215,7 @@ def test_llm_config(interface_format, api_key, base_url, model_name, temperature
             log_func(f"❌ LLM配置测试出错: {str(e)}")
             handle_exception_func("测试LLM配置时出错")
 
-    threading.Thread(target=task, daemon=True).start()
+    _submit_test_task(task)
 
 def test_embedding_config(api_key, base_url, interface_format, model_name, log_func, handle_exception_func):
     """测试当前的Embedding配置是否可用"""
@@ -166,4 +240,4 @@ def test_embedding_config(api_key, base_url, interface_format, model_name, log_f
             log_func(f"❌ Embedding配置测试出错: {str(e)}")
             handle_exception_func("测试Embedding配置时出错")
 
-    threading.Thread(target=task, daemon=True).start()
\ No newline at end of file
+    _submit_test_task(task)
\ No newline at end of file
@@ -4,14 +4,14 @@ import sys
 import logging
 import traceback
 import customtkinter as ctk
-from ui import NovelGeneratorGUI
+from utils import BufferedFileHandler
 
 # 配置日志
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(levelname)s - %(message)s',
     handlers=[
-        logging.FileHandler('app.log', encoding='utf-8'),
+        BufferedFileHandler('app.log'),
         logging.StreamHandler()
     ]
 )
@@ -28,19 +28,40 @@ def main():
         app.geometry("1350x840")
         app.minsize(1200, 800)
         
-        # 创建GUI
-        gui = NovelGeneratorGUI(app)
+        # 先显示加载提示，界面模块（含LLM、向量库等重量级依赖）在窗口出现后再导入
+        loading_label = ctk.CTkLabel(app, text="正在加载...", font=("Microsoft YaHei", 16))
+        loading_label.place(relx=0.5, rely=0.5, anchor="center")
+        app.update()
+        
+        app.after(10, lambda: _load_gui(app, loading_label))
         
         # 运行主循环
         app.mainloop()
         
+    except Exception as e:
+        logging.error(f"程序启动失败: {e}")
+        logging.error(f"详细错误信息: {traceback.format_exc()}")
+        sys.exit(1)
+
+def _load_gui(app, loading_label):
+    """导入界面模块并创建GUI，替换加载提示"""
+    try:
+        from ui import NovelGeneratorGUI
+        
+        loading_label.destroy()
+        
+        # 创建GUI，挂在主窗口上以保持引用
+        app.gui = NovelGeneratorGUI(app)
+        
     except ImportError as e:
         logging.error(f"导入模块失败: {e}")
         logging.error("请检查是否安装了所有必需的依赖包")
+        app.destroy()
         sys.exit(1)
     except Exception as e:
         logging.error(f"程序启动失败: {e}")
         logging.error(f"详细错误信息: {traceback.format_exc()}")
+        app.destroy()
         sys.exit(1)
 
 if __name__ == "__main__":
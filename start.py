@@ -8,7 +8,7 @@ AI小说生成器启动脚本
 import sys
 import os
 import subprocess
-import importlib
+from importlib.util import find_spec
 from pathlib import Path
 
 def check_python_version():
@@ -32,10 +32,9 @@ def check_dependencies():
     
     missing_packages = []
     
+    # 只查找模块规格而不真正导入，避免加载 torch 等重量级包
     for package in required_packages:
-        try:
-            importlib.import_module(package)
-        except ImportError:
+        if find_spec(package) is None:
             missing_packages.append(package)
     
     if missing_packages:
@@ -52,6 +51,7 @@ def check_dependencies():
 def setup_logging():
     """设置日志配置"""
     import logging
+    from utils import BufferedFileHandler
     
     log_dir = Path("logs")
     log_dir.mkdir(exist_ok=True)
@@ -60,7 +60,7 @@ def setup_logging():
         level=logging.INFO,
         format='%(asctime)s - %(levelname)s - %(message)s',
         handlers=[
-            logging.FileHandler('logs/app.log', encoding='utf-8'),
+            BufferedFileHandler('logs/app.log'),
             logging.StreamHandler()
         ]
     )
@@ -1,5 +1,6 @@
 # ui/llm_settings_tab.py
 # -*- coding: utf-8 -*-
+import logging
 import customtkinter as ctk
 from tkinter import messagebox
 from ui.config_tab import (
@@ -51,14 +52,8 @@ def build_llm_config_tabview(self):
         build_embeddings_config_tab(self)
         build_config_choose_tab(self)  # 恢复配置选择功能
         build_proxy_setting_tab(self)
-    except AttributeError as e:
-        print(f"构建配置选项卡时出错: {e}")
-        import traceback
-        traceback.print_exc()
-    except Exception as e:
-        print(f"其他错误: {e}")
-        import traceback
-        traceback.print_exc()
+    except Exception:
+        logging.exception("构建配置选项卡时出错")
     
     # 恢复原始config_frame
     if original_config_frame is not None:
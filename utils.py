@@ -60,3 +60,35 @@ def save_data_to_json(data: dict, file_path: str) -> bool:
     except Exception as e:
         print(f"[save_data_to_json] 保存数据到JSON文件时出错: {e}")
         return False
+
+
+class BufferedFileHandler(logging.FileHandler):
+    """
+    带写缓冲的日志文件处理器：低于 flush_level 的日志先写入缓冲区，缓冲区满、
+    出现 flush_level 及以上级别的日志或程序退出时才落盘，避免每条日志都触发一次写入。
+    """
+
+    def __init__(self, filename: str, encoding: str = 'utf-8',
+                 buffer_size: int = 1 << 16, flush_level: int = logging.WARNING):
+        self.buffer_size = buffer_size
+        self.flush_level = flush_level
+        self._defer_flush = False
+        super().__init__(filename, encoding=encoding)
+
+    def _open(self):
+        return open(self.baseFilename, self.mode, buffering=self.buffer_size,
+                    encoding=self.encoding, errors=self.errors)
+
+    def flush(self):
+        # emit() 每写一条日志都会调用 flush()，低级别日志在此跳过，只留在缓冲区
+        if not self._defer_flush:
+            super().flush()
+
+    def emit(self, record: logging.LogRecord):
+        # 处理器关闭后（如退出时仍在运行的守护线程）写入的日志不再有机会被刷新，需立即落盘
+        self._defer_flush = (record.levelno < self.flush_level
+                             and not getattr(self, '_closed', False))
+        try:
+            super().emit(record)
+        finally:
+            self._defer_flush = False